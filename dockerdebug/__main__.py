@@ -9,6 +9,7 @@ from typing import cast, Iterable
 import click
 from click.exceptions import ClickException
 from docker import DockerClient
+from docker.constants import DEFAULT_MAX_POOL_SIZE
 from docker.errors import NotFound
 from docker.models.containers import Container
 
@@ -23,6 +24,8 @@ logging.basicConfig(
 LOG = logging.getLogger("dockerdebug")
 LOG.setLevel(logging.WARNING)
 
+DEFAULT_STATS_WINDOW = 5.0
+
 
 class CannotFindLocalStackContainer(Exception):
     pass
@@ -120,14 +123,36 @@ def diagnose(source_container_id: str, target_container_id: str | None, target_i
 
 
 @main.command
-def probe():
+@click.option(
+    "--stats",
+    "with_stats",
+    help="Sample network throughput for each interface and network",
+    is_flag=True,
+)
+@click.option(
+    "--stats-window",
+    help=f"Number of seconds to sample network throughput over, implies --stats [default: {DEFAULT_STATS_WINDOW}]",
+    type=click.FloatRange(min=2.0),
+)
+def probe(with_stats: bool, stats_window: float | None):
     """
     Capture all running containers, their network attachments, their network interfaces
     and output to a JSON report.
     """
+    if with_stats and stats_window is None:
+        stats_window = DEFAULT_STATS_WINDOW
+
     client = DockerClient()
+    if stats_window is not None:
+        # every stats stream holds a connection for the whole window. urllib3 does
+        # not block when the pool is exhausted, it opens extra connections and then
+        # discards them with a "pool is full" warning, so size the pool to match
+        running = len(cast(list[Container], client.containers.list()))
+        client.close()
+        client = DockerClient(max_pool_size=max(DEFAULT_MAX_POOL_SIZE, running))
+
     prober = Prober(client)
-    report = prober.probe()
+    report = prober.probe(stats_window=stats_window)
     json.dump(report, sys.stdout, indent=2)
 
 
@@ -1,10 +1,18 @@
 from __future__ import annotations
-from typing import TypeVar, TypedDict, cast, Generator
+from typing import NotRequired, TypeVar, TypedDict, cast, Generator
 
 from docker import DockerClient
 from docker.models.containers import Container
 from docker.models.networks import Network
 
+from dockerdebug.stats import (
+    ContainerStats,
+    InterfaceStatsDefn,
+    NetworkStatsDefn,
+    StatsSampler,
+    sum_rates,
+)
+
 
 T = TypeVar("T")
 
@@ -22,12 +30,14 @@ class NetworkDefn(TypedDict):
     subnet: str | None
     gateway: str | None
     containers: list[ContainerDefn]
+    stats: NotRequired[NetworkStatsDefn]
 
 
 class InterfaceDefn(TypedDict):
     network_name: str
     gateway: str
     ip_address: str
+    stats: NotRequired[InterfaceStatsDefn]
 
 
 class ContainerDefn(TypedDict):
@@ -46,9 +56,20 @@ class Prober:
     def __init__(self, client: DockerClient):
         self.client = client
 
-    def probe(self) -> ProbeDefn:
+    def probe(self, stats_window: float | None = None) -> ProbeDefn:
+        docker_networks = cast(list[Network], self.client.networks.list(greedy=True))
+
+        stats: ContainerStats = {}
+        if stats_window is not None:
+            containers = {
+                container.id: container
+                for docker_network in docker_networks
+                for container in docker_network.containers
+            }
+            stats = StatsSampler(stats_window).sample(containers.values())
+
         networks = []
-        for docker_network in cast(list[Network], self.client.networks.list(greedy=True)):
+        for docker_network in docker_networks:
             assert docker_network.attrs is not None
             network: NetworkDefn = {
                 "id": docker_network.id or "",
@@ -60,26 +81,52 @@ class Prober:
                     "Gateway"
                 ),
                 "containers": [
-                    self._extract_container_info(container)
+                    self._extract_container_info(container, stats)
                     for container in docker_network.containers
                 ],
             }
+            if stats_window is not None:
+                network_stats = self._network_stats(network)
+                if network_stats is not None:
+                    network["stats"] = network_stats
             networks.append(network)
 
         return {"networks": networks}
 
-    def _extract_container_info(self, docker_container: Container) -> ContainerDefn:
+    def _network_stats(self, network: NetworkDefn) -> NetworkStatsDefn | None:
+        interfaces = [
+            interface
+            for container in network["containers"]
+            for interface in container["interfaces"]
+            if interface["network_name"] == network["name"]
+        ]
+        rates = [interface["stats"] for interface in interfaces if "stats" in interface]
+        if not rates:
+            # nothing was measured, which is not the same as an idle network
+            return None
+
+        return {
+            **sum_rates(rates),
+            "sampled_interfaces": len(rates),
+            "total_interfaces": len(interfaces),
+        }
+
+    def _extract_container_info(
+        self, docker_container: Container, stats: ContainerStats
+    ) -> ContainerDefn:
         container: ContainerDefn = {
             "id": docker_container.id or "",
             "name": docker_container.name or "",
             "image": ", ".join(docker_container.image.tags),
             "labels": docker_container.labels,
             "status": docker_container.status,
-            "interfaces": list(self._list_interfaces(docker_container)),
+            "interfaces": list(self._list_interfaces(docker_container, stats)),
         }
         return container
 
-    def _list_interfaces(self, container: Container) -> Generator[InterfaceDefn, None, None]:
+    def _list_interfaces(
+        self, container: Container, stats: ContainerStats
+    ) -> Generator[InterfaceDefn, None, None]:
         assert container.attrs is not None
 
         for name, defn in container.attrs.get("NetworkSettings", {}).get("Networks", {}).items():
@@ -88,4 +135,7 @@ class Prober:
                 "gateway": defn.get("Gateway", ""),
                 "ip_address": defn.get("IPAddress", ""),
             }
+            interface_stats = stats.get(container.id or "", {}).get(name)
+            if interface_stats is not None:
+                interface["stats"] = interface_stats
             yield interface
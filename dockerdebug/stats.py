@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import logging
+import re
+import time
+from typing import Any, Generator, Iterable, TypedDict, cast
+
+from docker.models.containers import Container
+from requests import Response
+
+LOG = logging.getLogger(__name__)
+
+# counters reported per interface by the docker stats API
+COUNTERS = ("rx_bytes", "tx_bytes", "rx_packets", "tx_packets")
+
+# e.g. 2023-08-16T08:34:44.123456789Z, the daemon reports nanoseconds
+TIMESTAMP_RE = re.compile(r"^(?P<seconds>[^.Z+]+)(?:\.(?P<fraction>\d+))?(?P<tz>Z|[+-]\d\d:\d\d)$")
+
+
+class InterfaceStatsDefn(TypedDict):
+    rx_bytes_per_sec: float
+    tx_bytes_per_sec: float
+    rx_packets_per_sec: float
+    tx_packets_per_sec: float
+
+
+class NetworkStatsDefn(InterfaceStatsDefn):
+    # number of interfaces attached to the network that produced rates, out of
+    # the total attached, so that a partial total is not mistaken for idle
+    sampled_interfaces: int
+    total_interfaces: int
+
+
+# container id => network name => rates
+ContainerStats = dict[str, dict[str, InterfaceStatsDefn]]
+
+
+def parse_timestamp(value: str) -> float | None:
+    """
+    Parse the `read` timestamp of a stats frame into seconds since the epoch.
+    """
+    match = TIMESTAMP_RE.match(value)
+    if match is None:
+        return None
+
+    tz = match.group("tz")
+    try:
+        parsed = datetime.fromisoformat(
+            match.group("seconds") + ("+00:00" if tz == "Z" else tz)
+        ).astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+    # the zero value is reported before the daemon has collected any counters
+    if parsed.year <= 1:
+        return None
+
+    fraction = match.group("fraction") or "0"
+    return parsed.timestamp() + int(fraction) / 10 ** len(fraction)
+
+
+@dataclass
+class CounterSample:
+    timestamp: float
+    counters: dict[str, int]
+
+
+@dataclass
+class InterfaceWindow:
+    """
+    First and most recent counter samples for a single interface. Only the two
+    end points are kept, so memory does not grow with the length of the window.
+    """
+
+    first: CounterSample
+    last: CounterSample
+
+    def update(self, sample: CounterSample):
+        if any(sample.counters[name] < self.last.counters[name] for name in COUNTERS):
+            # counters were reset, e.g. the container restarted
+            self.first = sample
+        self.last = sample
+
+    def rates(self) -> InterfaceStatsDefn | None:
+        elapsed = self.last.timestamp - self.first.timestamp
+        if elapsed <= 0:
+            return None
+
+        def rate(name: str) -> float:
+            return (self.last.counters[name] - self.first.counters[name]) / elapsed
+
+        return {
+            "rx_bytes_per_sec": rate("rx_bytes"),
+            "tx_bytes_per_sec": rate("tx_bytes"),
+            "rx_packets_per_sec": rate("rx_packets"),
+            "tx_packets_per_sec": rate("tx_packets"),
+        }
+
+
+def sum_rates(rates: list[InterfaceStatsDefn]) -> InterfaceStatsDefn:
+    return {
+        "rx_bytes_per_sec": sum(r["rx_bytes_per_sec"] for r in rates),
+        "tx_bytes_per_sec": sum(r["tx_bytes_per_sec"] for r in rates),
+        "rx_packets_per_sec": sum(r["rx_packets_per_sec"] for r in rates),
+        "tx_packets_per_sec": sum(r["tx_packets_per_sec"] for r in rates),
+    }
+
+
+class StatsSampler:
+    """
+    Sample the network counters of a set of containers over a fixed window.
+
+    One docker stats stream is opened per container and all streams are
+    consumed concurrently, one thread each, so the sampling window is shared
+    between containers rather than repeated for each one.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+
+    def sample(self, containers: Iterable[Container]) -> ContainerStats:
+        running = [c for c in containers if c.status == "running"]
+        if not running:
+            return {}
+
+        # every stream must be open for the whole window, so none can be queued
+        # behind another; the threads spend their time blocked on sockets
+        deadline = time.monotonic() + self.window
+        with ThreadPoolExecutor(max_workers=len(running)) as pool:
+            results = pool.map(lambda c: self._sample_container(c, deadline), running)
+            return {container.id or "": stats for container, stats in zip(running, results)}
+
+    def _sample_container(
+        self, container: Container, deadline: float
+    ) -> dict[str, InterfaceStatsDefn]:
+        try:
+            windows = self._read_stream(container, deadline)
+        except Exception as e:
+            LOG.warning(f"failed to read stats for container {container.name}: {e}")
+            return {}
+
+        rates = {}
+        for interface, window in windows.items():
+            interface_rates = window.rates()
+            if interface_rates is not None:
+                rates[interface] = interface_rates
+
+        if not rates:
+            return {}
+
+        try:
+            network_names = self._interface_network_names(container, list(rates.keys()))
+        except Exception as e:
+            LOG.warning(f"failed to map interfaces to networks for container {container.name}: {e}")
+            return {}
+
+        return {
+            network_names[interface]: interface_rates
+            for interface, interface_rates in rates.items()
+            if interface in network_names
+        }
+
+    def _read_stream(self, container: Container, deadline: float) -> dict[str, InterfaceWindow]:
+        windows: dict[str, InterfaceWindow] = {}
+        response, frames = self._open_stream(container)
+        try:
+            # the daemon sends a frame roughly every second, so checking the
+            # deadline as frames arrive overshoots it by at most that interval
+            for frame in frames:
+                self._record_frame(windows, frame)
+                if time.monotonic() >= deadline:
+                    break
+        finally:
+            frames.close()
+            response.close()
+
+        return windows
+
+    def _open_stream(
+        self, container: Container
+    ) -> tuple[Response, Generator[dict[str, Any], None, None]]:
+        """
+        Equivalent to `container.stats(stream=True, decode=True)`, but keeps hold
+        of the HTTP response. Closing the generator returned by docker-py does not
+        close the response, which would leave the connection streaming until it is
+        garbage collected.
+        """
+        api = container.client.api
+        response = api._get(
+            api._url("/containers/{0}/stats", container.id), stream=True, params={"stream": True}
+        )
+        return response, api._stream_helper(response, decode=True)
+
+    def _record_frame(self, windows: dict[str, InterfaceWindow], frame: dict[str, Any]):
+        # use the time the daemon collected the counters rather than the time
+        # the frame arrived, which includes transport and scheduling delays
+        timestamp = parse_timestamp(frame.get("read") or "")
+        if timestamp is None:
+            return
+
+        # containers using host networking do not report interfaces
+        for interface, counters in (frame.get("networks") or {}).items():
+            sample = CounterSample(
+                timestamp=timestamp,
+                counters={name: counters.get(name, 0) for name in COUNTERS},
+            )
+            if interface in windows:
+                windows[interface].update(sample)
+            else:
+                windows[interface] = InterfaceWindow(first=sample, last=sample)
+
+    def _interface_network_names(
+        self, container: Container, interfaces: list[str]
+    ) -> dict[str, str]:
+        """
+        The stats API reports interfaces by their name inside the container
+        (eth0, eth1, ...), whereas the topology is keyed by docker network name.
+        Match the two up using the MAC address of each interface, which requires
+        reading it from within the container.
+        """
+        assert container.attrs is not None
+        networks = container.attrs.get("NetworkSettings", {}).get("Networks", {})
+        if len(networks) == 1 and len(interfaces) == 1:
+            return {interfaces[0]: list(networks.keys())[0]}
+
+        mac_to_network = {
+            defn.get("MacAddress", "").lower(): name
+            for name, defn in networks.items()
+            if defn.get("MacAddress")
+        }
+
+        mapping = {}
+        for interface in interfaces:
+            # read each interface separately so one failure does not lose the rest
+            exit_code, output = container.exec_run(
+                ["cat", f"/sys/class/net/{interface}/address"], stderr=False
+            )
+            mac = cast(bytes, output).decode().strip().lower() if exit_code == 0 else ""
+            network_name = mac_to_network.get(mac)
+            if network_name is None:
+                LOG.warning(
+                    f"could not map interface {interface} of container {container.name} to a network, skipping stats"
+                )
+                continue
+
+            mapping[interface] = network_name
+        return mapping
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+
+class FakeResponse:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAPI:
+    def __init__(self, container: FakeContainer):
+        self.container = container
+
+    def _url(self, path: str, *args: str) -> str:
+        return path.format(*args)
+
+    def _get(self, url: str, **kwargs) -> FakeResponse:
+        return self.container.response
+
+    def _stream_helper(self, response: FakeResponse, decode: bool = False):
+        for frame in self.container.frames:
+            if self.container.frame_interval:
+                # like the daemon, block until the next frame is due
+                time.sleep(self.container.frame_interval)
+            self.container.frames_consumed += 1
+            yield frame
+
+
+class FakeDockerClient:
+    def __init__(self, container: FakeContainer):
+        self.api = FakeAPI(container)
+
+
+class FakeImage:
+    tags = ["example:latest"]
+
+
+class FakeContainer:
+    def __init__(
+        self,
+        id: str,
+        networks: dict[str, str],
+        frames: list[dict[str, Any]] | None = None,
+        macs: dict[str, str] | None = None,
+        exec_error: Exception | None = None,
+        frame_interval: float = 0.0,
+    ):
+        self.id = id
+        self.name = id
+        self.status = "running"
+        self.labels: dict[str, str] = {}
+        self.image = FakeImage()
+        self.attrs = {
+            "NetworkSettings": {
+                "Networks": {
+                    name: {"Gateway": "", "IPAddress": "", "MacAddress": mac}
+                    for name, mac in networks.items()
+                }
+            }
+        }
+        self.client = FakeDockerClient(self)
+        self.response = FakeResponse()
+        self.frames = frames or []
+        self.frame_interval = frame_interval
+        self.frames_consumed = 0
+        self.macs = macs or {}
+        self.exec_error = exec_error
+        self.exec_commands: list[list[str]] = []
+
+    def exec_run(self, cmd: list[str], **kwargs) -> tuple[int, bytes]:
+        self.exec_commands.append(cmd)
+        if self.exec_error is not None:
+            raise self.exec_error
+
+        interface = cmd[-1].split("/")[-2]
+        if interface not in self.macs:
+            return 1, b""
+        return 0, f"{self.macs[interface]}\n".encode()
+
+
+class FakeNetwork:
+    def __init__(self, name: str, containers: list[FakeContainer]):
+        self.id = name
+        self.name = name
+        self.containers = containers
+        self.attrs = {"IPAM": {"Config": [{"Subnet": "172.18.0.0/16", "Gateway": "172.18.0.1"}]}}
+
+
+class FakeNetworks:
+    def __init__(self, networks: list[FakeNetwork]):
+        self.networks = networks
+
+    def list(self, greedy: bool = False) -> list[FakeNetwork]:
+        return self.networks
+
+
+class FakeClient:
+    def __init__(self, networks: list[FakeNetwork]):
+        self.networks = FakeNetworks(networks)
+
+
+def frame(second: int, interfaces: dict[str, int]) -> dict[str, Any]:
+    """
+    A stats frame read at the given second, where each interface has sent and
+    received the given number of bytes, in 100 byte packets.
+    """
+    return {
+        "read": f"2023-08-16T08:34:{second:02d}.000000000Z",
+        "networks": {
+            interface: {
+                "rx_bytes": value,
+                "tx_bytes": value,
+                "rx_packets": value // 100,
+                "tx_packets": value // 100,
+            }
+            for interface, value in interfaces.items()
+        },
+    }
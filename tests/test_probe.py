@@ -0,0 +1,73 @@
+from dockerdebug.probe import Prober
+
+from tests.fakes import FakeClient, FakeContainer, FakeNetwork, frame
+
+
+def _client() -> FakeClient:
+    app = FakeContainer(
+        "app",
+        {"net-a": "02:42:ac:12:00:02"},
+        frames=[frame(0, {"eth0": 0}), frame(1, {"eth0": 100})],
+    )
+    localstack = FakeContainer(
+        "localstack",
+        {"net-a": "02:42:ac:12:00:03", "net-b": "02:42:ac:13:00:03"},
+        frames=[frame(0, {"eth0": 0, "eth1": 0}), frame(1, {"eth0": 200, "eth1": 1000})],
+        macs={"eth0": "02:42:ac:12:00:03", "eth1": "02:42:ac:13:00:03"},
+    )
+    return FakeClient(
+        [FakeNetwork("net-a", [app, localstack]), FakeNetwork("net-b", [localstack])]
+    )
+
+
+def test_probe_aggregates_stats_per_network():
+    report = Prober(_client()).probe(stats_window=60)
+
+    net_a, net_b = report["networks"]
+    # the localstack interface on net-b is not counted towards net-a
+    assert net_a["stats"]["rx_bytes_per_sec"] == 300.0
+    assert net_a["stats"]["sampled_interfaces"] == 2
+    assert net_a["stats"]["total_interfaces"] == 2
+    assert net_b["stats"]["rx_bytes_per_sec"] == 1000.0
+
+    localstack = net_a["containers"][1]
+    assert [i["stats"]["rx_bytes_per_sec"] for i in localstack["interfaces"]] == [200.0, 1000.0]
+
+
+def test_probe_without_stats():
+    prober = Prober(_client())
+    prober.probe(stats_window=60)
+
+    report = prober.probe()
+
+    for network in report["networks"]:
+        assert "stats" not in network
+        for container in network["containers"]:
+            for interface in container["interfaces"]:
+                assert "stats" not in interface
+
+
+def test_probe_mapping_failure():
+    app = FakeContainer(
+        "app",
+        {"net-a": "02:42:ac:12:00:02"},
+        frames=[frame(0, {"eth0": 0}), frame(1, {"eth0": 100})],
+    )
+    localstack = FakeContainer(
+        "localstack",
+        {"net-a": "02:42:ac:12:00:03", "net-b": "02:42:ac:13:00:03"},
+        frames=[frame(0, {"eth0": 0, "eth1": 0}), frame(1, {"eth0": 200, "eth1": 1000})],
+        exec_error=RuntimeError("container is not running"),
+    )
+    client = FakeClient(
+        [FakeNetwork("net-a", [app, localstack]), FakeNetwork("net-b", [localstack])]
+    )
+
+    net_a, net_b = Prober(client).probe(stats_window=60)["networks"]
+
+    # only partially measured
+    assert net_a["stats"]["rx_bytes_per_sec"] == 100.0
+    assert net_a["stats"]["sampled_interfaces"] == 1
+    assert net_a["stats"]["total_interfaces"] == 2
+    # not measured at all, rather than idle
+    assert "stats" not in net_b
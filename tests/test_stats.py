@@ -0,0 +1,191 @@
+import time
+
+from dockerdebug.stats import (
+    CounterSample,
+    InterfaceWindow,
+    StatsSampler,
+    parse_timestamp,
+    sum_rates,
+)
+
+from tests.fakes import FakeContainer, frame
+
+
+def _sample(timestamp: float, value: int) -> CounterSample:
+    return CounterSample(
+        timestamp=timestamp,
+        counters={
+            "rx_bytes": value,
+            "tx_bytes": 2 * value,
+            "rx_packets": value // 100,
+            "tx_packets": value // 50,
+        },
+    )
+
+
+def test_interface_window_rates():
+    window = InterfaceWindow(first=_sample(0.0, 0), last=_sample(0.0, 0))
+    assert window.rates() is None
+
+    window.update(_sample(1.0, 500))
+    window.update(_sample(2.0, 1000))
+
+    assert window.rates() == {
+        "rx_bytes_per_sec": 500.0,
+        "tx_bytes_per_sec": 1000.0,
+        "rx_packets_per_sec": 5.0,
+        "tx_packets_per_sec": 10.0,
+    }
+
+
+def test_interface_window_counter_reset():
+    window = InterfaceWindow(first=_sample(0.0, 1000), last=_sample(0.0, 1000))
+    window.update(_sample(1.0, 100))
+    window.update(_sample(3.0, 300))
+
+    rates = window.rates()
+    assert rates is not None
+    assert rates["rx_bytes_per_sec"] == 100.0
+
+
+def test_interface_window_counter_reset_above_first():
+    window = InterfaceWindow(first=_sample(0.0, 1000), last=_sample(0.0, 1000))
+    window.update(_sample(1.0, 5000))
+    # reset, then the counter grows back above the first sample
+    window.update(_sample(2.0, 2000))
+    window.update(_sample(4.0, 4000))
+
+    rates = window.rates()
+    assert rates is not None
+    assert rates["rx_bytes_per_sec"] == 1000.0
+
+
+def test_sum_rates():
+    rates = {
+        "rx_bytes_per_sec": 1.0,
+        "tx_bytes_per_sec": 2.0,
+        "rx_packets_per_sec": 3.0,
+        "tx_packets_per_sec": 4.0,
+    }
+    assert sum_rates([rates, rates])["tx_packets_per_sec"] == 8.0
+    assert sum_rates([])["rx_bytes_per_sec"] == 0.0
+
+
+def test_parse_timestamp():
+    assert parse_timestamp("2023-08-16T08:34:44.5Z") == 1692174884.5
+    assert parse_timestamp("2023-08-16T09:34:44.250000000+01:00") == 1692174884.25
+    assert parse_timestamp("0001-01-01T00:00:00Z") is None
+    assert parse_timestamp("") is None
+
+
+def test_read_stream_uses_frame_timestamps():
+    container = FakeContainer(
+        "app",
+        {"app-net": "02:42:ac:12:00:02"},
+        frames=[frame(0, {"eth0": 0}), frame(2, {"eth0": 1000})],
+    )
+    sampler = StatsSampler(window=60)
+
+    windows = sampler._read_stream(container, deadline=time.monotonic() + 60)
+
+    assert windows["eth0"].rates() == {
+        "rx_bytes_per_sec": 500.0,
+        "tx_bytes_per_sec": 500.0,
+        "rx_packets_per_sec": 5.0,
+        "tx_packets_per_sec": 5.0,
+    }
+    assert container.response.closed
+
+
+def test_read_stream_stops_at_deadline():
+    container = FakeContainer(
+        "app",
+        {"app-net": "02:42:ac:12:00:02"},
+        frames=[frame(i, {"eth0": i * 100}) for i in range(10)],
+    )
+    sampler = StatsSampler(window=0)
+
+    sampler._read_stream(container, deadline=time.monotonic())
+
+    assert container.frames_consumed == 1
+    assert container.response.closed
+
+
+def test_read_stream_without_networks():
+    container = FakeContainer(
+        "host",
+        {"host": ""},
+        frames=[
+            {"read": "2023-08-16T08:34:00Z"},
+            {"read": "2023-08-16T08:34:01Z", "networks": None},
+        ],
+    )
+    sampler = StatsSampler(window=60)
+
+    assert sampler._read_stream(container, deadline=time.monotonic() + 60) == {}
+
+
+def test_single_network_does_not_exec():
+    container = FakeContainer(
+        "app",
+        {"app-net": "02:42:ac:12:00:02"},
+        frames=[frame(0, {"eth0": 0}), frame(1, {"eth0": 100})],
+    )
+
+    stats = StatsSampler(window=60).sample([container])
+
+    assert list(stats["app"].keys()) == ["app-net"]
+    assert container.exec_commands == []
+
+
+def test_multiple_networks_mapped_by_mac():
+    container = FakeContainer(
+        "app",
+        {"net-a": "02:42:AC:12:00:02", "net-b": "02:42:ac:13:00:02"},
+        frames=[frame(0, {"eth0": 0, "eth1": 0}), frame(1, {"eth0": 100, "eth1": 300})],
+        # eth1 is missing, e.g. the interface went away
+        macs={"eth0": "02:42:ac:13:00:02"},
+    )
+
+    stats = StatsSampler(window=60).sample([container])
+
+    assert list(stats["app"].keys()) == ["net-b"]
+    assert stats["app"]["net-b"]["rx_bytes_per_sec"] == 100.0
+
+
+def test_exec_failure_does_not_fail_sampling():
+    failing = FakeContainer(
+        "failing",
+        {"net-a": "02:42:ac:12:00:02", "net-b": "02:42:ac:13:00:02"},
+        frames=[frame(0, {"eth0": 0, "eth1": 0}), frame(1, {"eth0": 100, "eth1": 100})],
+        exec_error=RuntimeError("container is not running"),
+    )
+    healthy = FakeContainer(
+        "healthy",
+        {"net-a": "02:42:ac:12:00:03"},
+        frames=[frame(0, {"eth0": 0}), frame(1, {"eth0": 100})],
+    )
+
+    stats = StatsSampler(window=60).sample([failing, healthy])
+
+    assert stats["failing"] == {}
+    assert list(stats["healthy"].keys()) == ["net-a"]
+
+
+def test_all_containers_sampled_concurrently():
+    containers = [
+        FakeContainer(
+            f"lambda-{i}",
+            {"ls-net": f"02:42:ac:12:00:{i:02x}"},
+            frames=[frame(second, {"eth0": second * 100}) for second in range(10)],
+            frame_interval=0.1,
+        )
+        for i in range(40)
+    ]
+
+    # if any stream were queued behind another it would start after the deadline
+    stats = StatsSampler(window=0.25).sample(containers)
+
+    assert len(stats) == 40
+    for container in containers:
+        assert stats[container.id]["ls-net"]["rx_bytes_per_sec"] == 100.0